@@ -37,6 +37,11 @@ from test.pylib.pool import Pool
 from test.pylib.scylla_cluster import ScyllaServer, ScyllaCluster, get_cluster_manager
 from typing import Dict, List, Callable, Any, Iterable, Optional, Awaitable
 
+try:
+    import uvloop   # type: ignore
+except ImportError:
+    uvloop = None
+
 output_is_a_tty = sys.stdout.isatty()
 
 all_modes = set(['debug', 'release', 'dev', 'sanitize', 'coverage'])
@@ -366,6 +371,7 @@ class PythonTestSuite(TestSuite):
 
         async def create_cluster() -> ScyllaCluster:
             cluster = ScyllaCluster(cluster_size, create_server)
+            self.artifacts.add_exit_artifact(self, cluster.api.close)
             await cluster.install_and_start()
             return cluster
 
@@ -664,7 +670,7 @@ class CQLApprovalTest(Test):
                 self.is_before_test_ok = True
                 cluster.take_log_savepoint()
                 self.is_executed_ok = await run_test(self, options, env=self.env)
-                cluster.after_test(self.uname)
+                await cluster.after_test(self.uname)
                 self.is_after_test_ok = True
 
                 if self.is_executed_ok is False:
@@ -806,7 +812,7 @@ class PythonTest(Test):
                 self.is_before_test_ok = True
                 cluster.take_log_savepoint()
                 status = await run_test(self, options)
-                cluster.after_test(self.uname)
+                await cluster.after_test(self.uname)
                 self.is_after_test_ok = True
                 self.success = status
             except Exception as e:
@@ -838,11 +844,10 @@ class TopologyTest(PythonTest):
 
         test_path = os.path.join(self.suite.options.tmpdir, self.mode)
         async with get_cluster_manager(self.uname, self.suite.clusters, test_path) as manager:
-            self.args.insert(0, "--manager-api={}".format(manager.sock_path))
-
             try:
                 # Note: start manager here so cluster (and its logs) is availale in case of failure
                 await manager.start()
+                self.args.insert(0, "--manager-api={}".format(manager.sock_path))
                 self.success = await run_test(self, options)
             except Exception as e:
                 self.server_log = manager.cluster.read_server_log()
@@ -1356,4 +1361,8 @@ if __name__ == "__main__":
     if sys.version_info < (3, 7):
         print("Python 3.7 or newer is required to run this program")
         sys.exit(-1)
+    # The harness drives many Scylla servers, their REST API and the manager
+    # API from a single event loop: use the faster uvloop when it's available
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     sys.exit(asyncio.run(workaround_python26789()))
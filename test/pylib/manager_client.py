@@ -9,7 +9,7 @@
    Manages driver refresh when cluster is cycled.
 """
 
-from typing import List, Optional, Callable, NamedTuple
+from typing import Dict, List, Optional, Callable, NamedTuple
 import logging
 from test.pylib.rest_client import UnixRESTClient, ScyllaRESTAPIClient
 from test.pylib.util import wait_for
@@ -38,18 +38,25 @@ class ManagerClient():
         self.con_gen = con_gen
         self.ccluster: Optional[CassandraCluster] = None
         self.cql: Optional[CassandraSession] = None
+        # Cluster details received at test setup, valid until the cluster is cycled
+        self.replicas_count: Optional[int] = None
+        self.host_ids: Dict[ServerNum, HostID] = {}
         # A client for communicating with ScyllaClusterManager (server)
         self.client = UnixRESTClient(sock_path)
         self.api = ScyllaRESTAPIClient()
 
     async def stop(self):
-        """Close driver"""
+        """Close driver and API client sessions"""
         self.driver_close()
+        await self.client.close()
+        await self.api.close()
 
-    async def driver_connect(self) -> None:
-        """Connect to cluster"""
+    async def driver_connect(self, running: Optional[List[ServerInfo]] = None) -> None:
+        """Connect to cluster, to the given running servers if already known"""
         if self.con_gen is not None:
-            servers = [s_info.ip_addr for s_info in await self.running_servers()]
+            if running is None:
+                running = await self.running_servers()
+            servers = [s_info.ip_addr for s_info in running]
             logger.debug("driver connecting to %s", servers)
             self.ccluster = self.con_gen(servers, self.port, self.use_ssl)
             self.cql = self.ccluster.connect()
@@ -69,24 +76,34 @@ class ManagerClient():
             self.ccluster.control_connection.refresh_node_list_and_token_map()
 
     async def before_test(self, test_case_name: str) -> None:
-        """Before a test starts check if cluster needs cycling and update driver connection"""
+        """Before a test starts check if cluster needs cycling and update driver connection.
+           The setup request also returns the cluster's details, so connecting the driver
+           needs no further requests."""
         logger.debug("before_test for %s", test_case_name)
-        dirty = await self.is_dirty()
-        if dirty:
-            self.driver_close()  # Close driver connection to old cluster
+        # Close driver connection to a dirty cluster before the manager stops it
+        if self.cql is not None and await self.is_dirty():
+            self.driver_close()
         try:
-            await self.client.get(f"/cluster/before-test/{test_case_name}")
+            setup = await self.client.post_json("/cluster/test/setup",
+                                                json={"test_case_name": test_case_name})
         except aiohttp.ClientError as exc:
             raise RuntimeError(f"Failed before test check {exc}") from exc
+        if setup["cycled"]:
+            self.driver_close()  # In case the cluster got dirty after the check above
+        self.replicas_count = int(setup["replicas"])
+        self.host_ids = {ServerNum(int(server_id)): HostID(host_id)
+                         for server_id, host_id in setup["host_ids"].items()}
         if self.cql is None:
             # TODO: if cluster is not up yet due to taking long and HTTP timeout, wait for it
             # await self._wait_for_cluster()
-            await self.driver_connect()  # Connect driver to new cluster
+            running = [ServerInfo(ServerNum(int(info[0])), IPAddress(info[1]))
+                       for info in setup["running"]]
+            await self.driver_connect(running)  # Connect driver to new cluster
 
     async def after_test(self, test_case_name: str) -> None:
         """Tell harness this test finished"""
         logger.debug("after_test for %s", test_case_name)
-        await self.client.get(f"/cluster/after-test")
+        await self.client.post("/cluster/after-test")
 
     async def is_manager_up(self) -> bool:
         """Check if Manager server is up"""
@@ -105,6 +122,8 @@ class ManagerClient():
 
     async def replicas(self) -> int:
         """Get number of configured replicas for the cluster (replication factor)"""
+        if self.replicas_count is not None:
+            return self.replicas_count
         resp = await self.client.get_text("/cluster/replicas")
         return int(resp)
 
@@ -121,34 +140,34 @@ class ManagerClient():
     async def mark_dirty(self) -> None:
         """Manually mark current cluster dirty.
            To be used when a server was modified outside of this API."""
-        await self.client.get_text("/cluster/mark-dirty")
+        await self.client.post("/cluster/mark-dirty")
 
     async def server_stop(self, server_id: ServerNum) -> None:
         """Stop specified server"""
         logger.debug("ManagerClient stopping %s", server_id)
-        await self.client.get_text(f"/cluster/server/{server_id}/stop")
+        await self.client.post(f"/cluster/server/{server_id}/stop")
 
     async def server_stop_gracefully(self, server_id: ServerNum) -> None:
         """Stop specified server gracefully"""
         logger.debug("ManagerClient stopping gracefully %s", server_id)
-        await self.client.get_text(f"/cluster/server/{server_id}/stop_gracefully")
+        await self.client.post(f"/cluster/server/{server_id}/stop_gracefully")
 
     async def server_start(self, server_id: ServerNum) -> None:
         """Start specified server"""
         logger.debug("ManagerClient starting %s", server_id)
-        await self.client.get_text(f"/cluster/server/{server_id}/start")
+        await self.client.post(f"/cluster/server/{server_id}/start")
         self._driver_update()
 
     async def server_restart(self, server_id: ServerNum) -> None:
         """Restart specified server"""
         logger.debug("ManagerClient restarting %s", server_id)
-        await self.client.get_text(f"/cluster/server/{server_id}/restart")
+        await self.client.post(f"/cluster/server/{server_id}/restart")
         self._driver_update()
 
     async def server_add(self) -> ServerInfo:
         """Add a new server"""
         try:
-            server_info = await self.client.get_json("/cluster/addserver")
+            server_info = await self.client.post_json("/cluster/addserver")
         except Exception as exc:
             raise Exception("Failed to add server") from exc
         try:
@@ -171,7 +190,15 @@ class ManagerClient():
     async def decommission_node(self, server_id: ServerNum) -> None:
         """Tell a node to decommission with Scylla REST API"""
         logger.debug("ManagerClient decommission %s", server_id)
-        await self.client.get_text(f"/cluster/decommission-node/{server_id}")
+        await self.client.post(f"/cluster/decommission-node/{server_id}")
+        self._driver_update()
+
+    async def topology_batch(self, ops: List[dict]) -> None:
+        """Run several topology operations with a single request, in order.
+           An operation is either {"op": "remove", "initiator": id, "server_id": id,
+           "ignore_dead": [ip, ...]} or {"op": "decommission", "server_id": id}."""
+        logger.debug("ManagerClient topology batch %s", ops)
+        await self.client.post("/cluster/batch", json={"ops": ops})
         self._driver_update()
 
     async def server_get_config(self, server_id: ServerNum) -> dict[str, object]:
@@ -210,6 +237,8 @@ class ManagerClient():
 
     async def get_host_id(self, server_id: ServerNum) -> HostID:
         """Get local host id of a server"""
+        if server_id in self.host_ids:
+            return self.host_ids[server_id]
         try:
             host_id = await self.client.get_text(f"/cluster/host-id/{server_id}")
         except Exception as exc:
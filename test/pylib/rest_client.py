@@ -6,13 +6,13 @@
 """Asynchronous helper for Scylla REST API operations.
 """
 from __future__ import annotations                           # Type hints as strings
-from abc import ABCMeta
+from abc import ABCMeta, abstractmethod
 from collections.abc import Mapping
 import logging
 import os.path
 from typing import Any, Optional
 from contextlib import asynccontextmanager
-from aiohttp import request, BaseConnector, UnixConnector
+from aiohttp import ClientSession, BaseConnector, TCPConnector, UnixConnector
 import pytest
 from test.pylib.internal_types import IPAddress, HostID
 
@@ -33,13 +33,30 @@ class HTTPError(Exception):
 
 # TODO: support ssl and verify_ssl
 class RESTClient(metaclass=ABCMeta):
-    """Base class for sesion-free REST client"""
-    connector: Optional[BaseConnector]
+    """Base class for REST client.
+       Keeps one session, so connections are kept alive and reused across requests.
+       The session is created on first use, call close() when done."""
+    session: Optional[ClientSession] = None
     uri_scheme: str   # e.g. http, http+unix
     default_host: str
     default_port: Optional[int]
     # pylint: disable=too-many-arguments
 
+    @abstractmethod
+    def _new_connector(self) -> BaseConnector:
+        """Create the connector for a new session"""
+
+    def _get_session(self) -> ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = ClientSession(connector=self._new_connector())
+        return self.session
+
+    async def close(self) -> None:
+        """Close the session and its connections"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
     async def _fetch(self, method: str, resource: str, response_type: Optional[str] = None,
                      host: Optional[str] = None, port: Optional[int] = None,
                      params: Optional[Mapping[str, str]] = None,
@@ -57,9 +74,8 @@ class RESTClient(metaclass=ABCMeta):
         uri = self.uri_scheme + "://" + host_str + port_str + resource
         logging.debug(f"RESTClient fetching {method} {uri}")
 
-        async with request(method, uri,
-                           connector = self.connector if hasattr(self, "connector") else None,
-                           params = params, json = json) as resp:
+        async with self._get_session().request(method, uri,
+                                               params = params, json = json) as resp:
             if resp.status != 200:
                 text = await resp.text()
                 raise HTTPError(uri, resp.status, f"{text}, params {params}, json {json}")
@@ -94,6 +110,13 @@ class RESTClient(metaclass=ABCMeta):
         await self._fetch("POST", resource_uri, host = host, port = port, params = params,
                           json = json)
 
+    async def post_json(self, resource_uri: str, host: Optional[str] = None,
+                        port: Optional[int] = None, params: Optional[Mapping[str, str]] = None,
+                        json: Optional[Mapping] = None) -> Any:
+        """Post and get JSON back. Caller must check JSON content types."""
+        return await self._fetch("POST", resource_uri, response_type = "json", host = host,
+                                 port = port, params = params, json = json)
+
     async def put_json(self, resource_uri: str, data: Mapping, host: Optional[str] = None,
                        port: Optional[int] = None, params: Optional[dict[str, str]] = None) -> None:
         await self._fetch("PUT", resource_uri, host = host, port = port, params = params,
@@ -114,7 +137,10 @@ class UnixRESTClient(RESTClient):
         #       host parameter is ignored but set to socket name as convention
         self.uri_scheme: str = "http+unix"
         self.default_host: str = f"{os.path.basename(sock_path)}"
-        self.connector = UnixConnector(path=sock_path)
+        self.sock_path = sock_path
+
+    def _new_connector(self) -> BaseConnector:
+        return UnixConnector(path=self.sock_path)
 
 
 class TCPRESTClient(RESTClient):
@@ -122,9 +148,12 @@ class TCPRESTClient(RESTClient):
 
     def __init__(self, port: int):
         self.uri_scheme = "http"
-        self.connector = None
         self.default_port: int = port
 
+    def _new_connector(self) -> BaseConnector:
+        # Requests go to many servers, don't limit the number of connections
+        return TCPConnector(limit=0, keepalive_timeout=60)
+
 
 class ScyllaRESTAPIClient():
     """Async Scylla REST API client"""
@@ -132,6 +161,10 @@ class ScyllaRESTAPIClient():
     def __init__(self, port: int = 10000):
         self.client = TCPRESTClient(port)
 
+    async def close(self) -> None:
+        """Close the connections to the servers"""
+        await self.client.close()
+
     async def get_host_id(self, server_ip: IPAddress) -> HostID:
         """Get server id (UUID)"""
         host_uuid = await self.client.get_text("/storage_service/hostid/local", host=server_ip)
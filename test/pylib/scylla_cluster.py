@@ -8,25 +8,37 @@
 """
 import asyncio
 from asyncio.subprocess import Process
-from contextlib import asynccontextmanager
 from collections import ChainMap
+import functools
+import hashlib
 import itertools
+import json
 import logging
 import os
 import pathlib
 import shutil
 import tempfile
-import time
-from typing import Optional, Dict, List, Set, Tuple, Callable, AsyncIterator, NamedTuple
+from types import MappingProxyType
+from typing import Any, Optional, Dict, List, Set, Tuple, Callable, Awaitable, AsyncContextManager, \
+        NamedTuple, Mapping, MutableMapping, cast
 import uuid
-from io import BufferedWriter
+from io import FileIO
 from test.pylib.pool import Pool
+from test.pylib.util import wrap_future
 from test.pylib.rest_client import ScyllaRESTAPIClient, HTTPError
 from test.pylib.manager_client import ServerNum, IPAddress, HostID, ServerInfo
 import aiohttp
 import aiohttp.web
 import yaml
 import signal
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper                         # type: ignore
+try:
+    import orjson                                       # type: ignore
+except ImportError:
+    orjson = None                                       # type: ignore
 
 from cassandra import InvalidRequest                    # type: ignore
 from cassandra import OperationTimedOut                 # type: ignore
@@ -39,7 +51,98 @@ from cassandra.cluster import EXEC_PROFILE_DEFAULT  # pylint: disable=no-name-in
 from cassandra.policies import WhiteListRoundRobinPolicy  # type: ignore
 
 
+def json_dumps(data: object) -> bytes:
+    """Serialize to JSON, with the faster orjson when available"""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON, with the faster orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_response(data: object) -> aiohttp.web.Response:
+    """Like aiohttp.web.json_response, but uses orjson when available"""
+    return aiohttp.web.Response(body=json_dumps(data), content_type="application/json")
+
+
+def ok_response() -> aiohttp.web.Response:
+    """Plain "OK" response; Response objects are single use, only the body is shared"""
+    return aiohttp.web.Response(body=b"OK", content_type="text/plain", charset="utf-8")
+
+
+def bool_response(value: bool) -> aiohttp.web.Response:
+    """Plain "True"/"False" response, as parsed by ManagerClient"""
+    return aiohttp.web.Response(body=b"True" if value else b"False", content_type="text/plain",
+                                charset="utf-8")
+
+
+@aiohttp.web.middleware
+async def _parse_server_ids(request: aiohttp.web.Request, handler) -> aiohttp.web.StreamResponse:
+    """Parse server id path components once for all cluster manager handlers.
+       Routes only match digits, so the conversion can't fail."""
+    for key in ("server_id", "initiator"):
+        if key in request.match_info:
+            request[key] = ServerNum(int(request.match_info[key]))
+    return await handler(request)
+
+
+def _raise_first_exception(results: List[Any]) -> None:
+    """Raise the first exception among asyncio.gather(..., return_exceptions=True) results"""
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+# Configuration options which are the same for all servers. Servers only
+# keep their own options and look up the rest here, so it must not change.
+SCYLLA_COMMON_CONF: Mapping[str, object] = MappingProxyType({
+    'developer_mode': True,
+
+    # Allow testing experimental features. Following issue #9467, we need
+    # to add here specific experimental features as they are introduced.
+    'enable_user_defined_functions': True,
+    'experimental': True,
+    'experimental_features': ['raft', 'udf'],
+
+    'skip_wait_for_gossip_to_settle': 0,
+    'ring_delay_ms': 0,
+    'num_tokens': 16,
+    'flush_schema_tables_after_modification': False,
+    'auto_snapshot': False,
+
+    # Significantly increase default timeouts to allow running tests
+    # on a very slow setup (but without network losses). Note that these
+    # are server-side timeouts: The client should also avoid timing out
+    # its own requests - for this reason we increase the CQL driver's
+    # client-side timeout in conftest.py.
+
+    'range_request_timeout_in_ms': 300000,
+    'read_request_timeout_in_ms': 300000,
+    'counter_write_request_timeout_in_ms': 300000,
+    'cas_contention_timeout_in_ms': 300000,
+    'truncate_request_timeout_in_ms': 300000,
+    'write_request_timeout_in_ms': 300000,
+    'request_timeout_in_ms': 300000,
+
+    'strict_allow_filtering': True,
+
+    'permissions_update_interval_in_ms': 100,
+    'permissions_validity_in_ms': 100,
+})
+
+# SCYLLA_COMMON_CONF goes into every scylla.yaml, serialize it only once
+SCYLLA_COMMON_CONF_YAML = yaml.dump(dict(SCYLLA_COMMON_CONF), Dumper=SafeDumper)
+
+
+def _config_over_common(own_config: Dict[str, object]) -> ChainMap[str, object]:
+    """A server's configuration: its own options, falling back to the common ones.
+       Writes only go to the first map, so the read-only common map is never modified."""
+    return ChainMap(own_config, cast(MutableMapping[str, object], SCYLLA_COMMON_CONF))
+
+
 def make_scylla_conf(workdir: pathlib.Path, host_addr: str, seed_addrs: List[str], cluster_name: str) -> dict[str, object]:
+    """Server specific configuration options, on top of SCYLLA_COMMON_CONF"""
     return {
         'cluster_name': cluster_name,
         'workdir': str(workdir.resolve()),
@@ -54,46 +157,24 @@ def make_scylla_conf(workdir: pathlib.Path, host_addr: str, seed_addrs: List[str
                 'seeds': '{}'.format(','.join(seed_addrs))
                 }]
             }],
-
-        'developer_mode': True,
-
-        # Allow testing experimental features. Following issue #9467, we need
-        # to add here specific experimental features as they are introduced.
-        'enable_user_defined_functions': True,
-        'experimental': True,
-        'experimental_features': ['raft', 'udf'],
-
-        'skip_wait_for_gossip_to_settle': 0,
-        'ring_delay_ms': 0,
-        'num_tokens': 16,
-        'flush_schema_tables_after_modification': False,
-        'auto_snapshot': False,
-
-        # Significantly increase default timeouts to allow running tests
-        # on a very slow setup (but without network losses). Note that these
-        # are server-side timeouts: The client should also avoid timing out
-        # its own requests - for this reason we increase the CQL driver's
-        # client-side timeout in conftest.py.
-
-        'range_request_timeout_in_ms': 300000,
-        'read_request_timeout_in_ms': 300000,
-        'counter_write_request_timeout_in_ms': 300000,
-        'cas_contention_timeout_in_ms': 300000,
-        'truncate_request_timeout_in_ms': 300000,
-        'write_request_timeout_in_ms': 300000,
-        'request_timeout_in_ms': 300000,
-
-        'strict_allow_filtering': True,
-
-        'permissions_update_interval_in_ms': 100,
-        'permissions_validity_in_ms': 100,
     }
 
+# Scylla logs this once it has started all its services, including CQL
+SCYLLA_STARTED_LOG_MARKER = b"initialization completed."
+
+# CQL native protocol v4 OPTIONS request: version, flags, stream 0, opcode
+# OPTIONS, empty body. A serving CQL port answers it with SUPPORTED.
+CQL_OPTIONS_FRAME = bytes([0x04, 0x00, 0x00, 0x00, 0x05, 0x00, 0x00, 0x00, 0x00])
+CQL_FRAME_HEADER_SIZE = 9
+CQL_OPCODE_SUPPORTED = 0x06
+# A port accepting connections but not answering is not up yet either
+CQL_PROBE_TIMEOUT = 5   # seconds
+
 # Seastar options can not be passed through scylla.yaml, use command line
 # for them. Keep everything else in the configuration file to make
 # it easier to restart. Sic: if you make a typo on the command line,
 # Scylla refuses to boot.
-SCYLLA_CMDLINE_OPTIONS = [
+SCYLLA_CMDLINE_OPTIONS = (
     '--smp', '2',
     '-m', '1G',
     '--collectd', '0',
@@ -105,7 +186,7 @@ SCYLLA_CMDLINE_OPTIONS = [
     '--abort-on-seastar-bad-alloc',
     '--abort-on-internal-error', '1',
     '--abort-on-ebadf', '1'
-]
+)
 
 
 class ScyllaServer:
@@ -118,9 +199,11 @@ class ScyllaServer:
     workdir: pathlib.Path
     log_filename: pathlib.Path
     config_filename: pathlib.Path
-    log_file: BufferedWriter
+    log_file: FileIO
     host_id: HostID                             # Host id (UUID)
+    host_id_bytes: bytes                        # Encoded for the manager API
     ip_addr: IPAddress
+    ip_bytes: bytes                             # Encoded for the manager API
     newid = itertools.count(start=1).__next__   # Sequential unique id
 
     def __init__(self, exe: str, vardir: str,
@@ -134,16 +217,23 @@ class ScyllaServer:
         self.vardir = pathlib.Path(vardir)
         self.host_registry = host_registry
         self.cmdline_options = cmdline_options
+        # Add suite-specific command line options
+        self.scylla_args: Tuple[str, ...] = SCYLLA_CMDLINE_OPTIONS + tuple(cmdline_options)
         self.cluster_name = cluster_name
         self.seeds = seeds
         self.cmd: Optional[Process] = None
         self.log_savepoint = 0
+        # First lines of the log and the offset where they end, see read_log()
+        self.log_head: Optional[Tuple[str, int]] = None
         self.control_cluster: Optional[Cluster] = None
         self.control_connection: Optional[Session] = None
         self.config_options = config_options
-        # Sum of basic server configuration and the user-provided config options (self.config_options).
+        # Basic server configuration and the user-provided config options (self.config_options)
+        # over SCYLLA_COMMON_CONF. Updates only go to the first map, the common one is shared.
         # Calculated in `install` as only then we know the seed servers.
-        self.config: Dict[str, object] = {}
+        self.config: ChainMap[str, object] = _config_over_common({})
+        # Digest of the last written conf/scylla.yaml, to skip rewriting the same contents
+        self.config_digest: Optional[bytes] = None
 
         async def stop_server() -> None:
             if self.is_running:
@@ -155,18 +245,6 @@ class ScyllaServer:
         self.stop_artifact = stop_server
         self.uninstall_artifact = uninstall_server
 
-    async def install_and_start(self, api: ScyllaRESTAPIClient) -> None:
-        """Setup and start this server"""
-        await self.install()
-
-        logging.info("starting server at host %s in %s...", self.ip_addr, self.workdir.name)
-
-        await self.start(api)
-
-        if self.cmd:
-            logging.info("started server at host %s in %s, pid %d", self.ip_addr,
-                         self.workdir.name, self.cmd.pid)
-
     @property
     def is_running(self) -> bool:
         """Check the server subprocess is up"""
@@ -177,15 +255,16 @@ class ScyllaServer:
         if not os.access(self.exe, os.X_OK):
             raise RuntimeError(f"{self.exe} is not executable")
 
-    async def install(self) -> None:
+    async def install(self, ip_addr: Optional[IPAddress] = None) -> None:
         """Create a working directory with all subdirectories, initialize
-        a configuration file."""
+        a configuration file. Use `ip_addr` if it was leased by the caller."""
 
         self.check_scylla_executable()
 
         # Scylla assumes all instances of a cluster use the same port,
         # so each instance needs an own IP address.
-        self.ip_addr = await self.host_registry.lease_host()
+        self.ip_addr = ip_addr if ip_addr is not None else await self.host_registry.lease_host()
+        self.ip_bytes = self.ip_addr.encode()
         if not self.seeds:
             self.seeds = [self.ip_addr]
         # Use the last part in host IP 127.151.3.27 -> 27
@@ -201,6 +280,12 @@ class ScyllaServer:
 
         self.config_filename = self.workdir / "conf/scylla.yaml"
 
+        # The setup is all blocking file system calls, run it off the event
+        # loop so servers of a cluster are installed in parallel
+        await asyncio.get_running_loop().run_in_executor(None, self._install_files)
+
+    def _install_files(self) -> None:
+        """Create the working directory, the configuration file and the log file"""
         # Delete the remains of the previous run
 
         # Cleanup any remains of the previously running server in this path
@@ -209,26 +294,29 @@ class ScyllaServer:
         self.workdir.mkdir(parents=True, exist_ok=True)
         self.config_filename.parent.mkdir(parents=True, exist_ok=True)
         # Create a configuration file.
-        self.config = make_scylla_conf(
-                workdir = self.workdir,
-                host_addr = self.ip_addr,
-                seed_addrs = self.seeds,
-                cluster_name = self.cluster_name) \
-            | self.config_options
+        self.config = _config_over_common(
+            make_scylla_conf(workdir = self.workdir,
+                             host_addr = self.ip_addr,
+                             seed_addrs = self.seeds,
+                             cluster_name = self.cluster_name)
+            | self.config_options)
         self._write_config_file()
 
-        self.log_file = self.log_filename.open("wb")
+        # Open in append mode, unbuffered: the kernel puts every write of ours
+        # and Scylla's at the end of the file, so markers need no seek or flush
+        self.log_filename.unlink(missing_ok=True)
+        self.log_file = self.log_filename.open("ab", buffering=0)
+        self.log_head = None
 
     def get_config(self) -> dict[str, object]:
         """Return the contents of conf/scylla.yaml as a dict."""
-        return self.config
+        return dict(self.config)
 
     def update_config(self, key: str, value: object) -> None:
         """Update conf/scylla.yaml by setting `value` under `key`.
-           If we're running, reload the config with a SIGHUP."""
+           If we're running and the file changed, reload the config with a SIGHUP."""
         self.config[key] = value
-        self._write_config_file()
-        if self.cmd:
+        if self._write_config_file() and self.cmd:
             self.cmd.send_signal(signal.SIGHUP)
 
     def take_log_savepoint(self) -> None:
@@ -242,50 +330,87 @@ class ScyllaServer:
         avoid a nessted exception."""
         try:
             with self.log_filename.open("r") as log:
-                # Read the first 5 lines of the start log
-                lines: List[str] = []
-                for _ in range(3):
-                    lines.append(log.readline())
+                if self.log_head is None:
+                    # Read the first 3 lines of the start log
+                    head = "".join(log.readline() for _ in range(3))
+                    head_end = log.tell()
+                    # They don't change once written, remember them for next time
+                    if head.count("\n") == 3:
+                        self.log_head = (head, head_end)
+                else:
+                    head, head_end = self.log_head
+                    log.seek(head_end)
                 # Read the lines since the last savepoint
-                if self.log_savepoint and self.log_savepoint > log.tell():
+                if self.log_savepoint > head_end:
                     log.seek(self.log_savepoint)
-                return "".join(lines + log.readlines())
+                return head + log.read()
         except Exception as exc:    # pylint: disable=broad-except
             return f"Exception when reading server log {self.log_filename}: {exc}"
 
+    def _control_session(self) -> Session:
+        """Return the driver session to this server, connecting it on first use.
+           The same session serves the start up check and later control queries."""
+        if self.control_connection is None:
+            auth = PlainTextAuthProvider(username='cassandra', password='cassandra')
+            profile = ExecutionProfile(load_balancing_policy=WhiteListRoundRobinPolicy([self.ip_addr]),
+                                       request_timeout=self.START_TIMEOUT)
+            # In a cluster setup, it's possible that the CQL
+            # here is directed to a node different from the initial contact
+            # point, so make sure we execute the checks strictly via
+            # this connection
+            self.control_cluster = Cluster(execution_profiles={EXEC_PROFILE_DEFAULT: profile},
+                                           contact_points=[self.ip_addr],
+                                           # This is the latest version Scylla supports
+                                           protocol_version=4,
+                                           auth_provider=auth)
+            try:
+                self.control_connection = self.control_cluster.connect()
+            except:
+                # The driver shuts down a Cluster which failed to connect
+                self.control_cluster = None
+                raise
+        return self.control_connection
+
+    async def cql_port_is_up(self) -> bool:
+        """Check the CQL port answers an OPTIONS request. Much cheaper than
+           setting up a driver Cluster, which is only worth it once this works."""
+        port = int(self.config.get('native_transport_port', 9042))    # type: ignore
+
+        async def probe() -> bool:
+            reader, writer = await asyncio.open_connection(self.ip_addr, port)
+            try:
+                writer.write(CQL_OPTIONS_FRAME)
+                await writer.drain()
+                header = await reader.readexactly(CQL_FRAME_HEADER_SIZE)
+                return header[4] == CQL_OPCODE_SUPPORTED
+            finally:
+                writer.close()
+                await writer.wait_closed()
+
+        try:
+            return await asyncio.wait_for(probe(), timeout=CQL_PROBE_TIMEOUT)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return False
+
     async def cql_is_up(self) -> bool:
         """Test that CQL is serving (a check we use at start up)."""
+        if self.control_connection is None and not await self.cql_port_is_up():
+            return False
         caslog = logging.getLogger('cassandra')
         oldlevel = caslog.getEffectiveLevel()
         # Be quiet about connection failures.
         caslog.setLevel('CRITICAL')
-        auth = PlainTextAuthProvider(username='cassandra', password='cassandra')
         # auth::standard_role_manager creates "cassandra" role in an
         # async loop auth::do_after_system_ready(), which retries
         # role creation with an exponential back-off. In other
         # words, even after CQL port is up, Scylla may still be
         # initializing. When the role is ready, queries begin to
         # work, so rely on this "side effect".
-        profile = ExecutionProfile(load_balancing_policy=WhiteListRoundRobinPolicy([self.ip_addr]),
-                                   request_timeout=self.START_TIMEOUT)
         try:
-            # In a cluster setup, it's possible that the CQL
-            # here is directed to a node different from the initial contact
-            # point, so make sure we execute the checks strictly via
-            # this connection
-            with Cluster(execution_profiles={EXEC_PROFILE_DEFAULT: profile},
-                         contact_points=[self.ip_addr],
-                         # This is the latest version Scylla supports
-                         protocol_version=4,
-                         auth_provider=auth) as cluster:
-                with cluster.connect() as session:
-                    session.execute("SELECT * FROM system.local")
-                    self.control_cluster = Cluster(execution_profiles=
-                                                        {EXEC_PROFILE_DEFAULT: profile},
-                                                   contact_points=[self.ip_addr],
-                                                   auth_provider=auth)
-                    self.control_connection = self.control_cluster.connect()
-                    return True
+            # Connecting blocks, do it off the event loop
+            session = await asyncio.get_running_loop().run_in_executor(None, self._control_session)
+            await wrap_future(session.execute_async("SELECT * FROM system.local"))
+            return True
         except (NoHostAvailable, InvalidRequest, OperationTimedOut) as exc:
             logging.debug("Exception when checking if CQL is up: %s", exc)
             return False
@@ -297,6 +422,7 @@ class ScyllaServer:
         """Try to get the host id (also tests Scylla REST API is serving)"""
         try:
             self.host_id = await api.get_host_id(self.ip_addr)
+            self.host_id_bytes = self.host_id.encode()
             return True
         except (aiohttp.ClientConnectionError, HTTPError) as exc:
             if isinstance(exc, HTTPError) and exc.code >= 500:
@@ -307,13 +433,14 @@ class ScyllaServer:
     async def start(self, api: ScyllaRESTAPIClient) -> None:
         """Start an installed server. May be used for restarts."""
 
-        # Add suite-specific command line options
-        scylla_args = SCYLLA_CMDLINE_OPTIONS + self.cmdline_options
-        env = os.environ.copy()
-        env.clear()     # pass empty env to make user user's SCYLLA_HOME has no impact
+        logging.info("starting server at host %s in %s...", self.ip_addr, self.workdir.name)
+
+        env: Dict[str, str] = {}    # pass empty env to make user user's SCYLLA_HOME has no impact
+        # Scylla shares the file offset with self.log_file, so this is where its output begins
+        log_offset = self.log_file.tell()
         self.cmd = await asyncio.create_subprocess_exec(
             self.exe,
-            *scylla_args,
+            *self.scylla_args,
             cwd=self.workdir,
             stderr=self.log_file,
             stdout=self.log_file,
@@ -321,64 +448,121 @@ class ScyllaServer:
             preexec_fn=os.setsid,
         )
 
-        self.start_time = time.time()
+        try:
+            await self._wait_until_up(api, log_offset)
+        except:
+            # The driver may have connected before the start failed: release
+            # its sockets now rather than when the server is stopped
+            await self.shutdown_control_connection()
+            raise
+
+    async def _wait_until_up(self, api: ScyllaRESTAPIClient, log_offset: int) -> None:
+        """Wait until the just spawned server serves REST and CQL requests.
+           Its output begins at `log_offset` in the log."""
+        assert self.cmd is not None
+        loop = asyncio.get_running_loop()
+        # Use the monotonic loop clock for the timeout
+        self.start_time = loop.time()
         sleep_interval = 0.1
 
-        while time.time() < self.start_time + self.START_TIMEOUT:
+        # Probing REST and CQL before Scylla is up is expensive: every failed
+        # CQL check builds and tears down a driver Cluster. Wait for Scylla
+        # to report it is up in its log, the probes below then usually
+        # succeed at first try.
+        await self._wait_for_log_marker(SCYLLA_STARTED_LOG_MARKER, log_offset,
+                                        self.start_time + self.START_TIMEOUT)
+
+        while loop.time() < self.start_time + self.START_TIMEOUT:
             if self.cmd.returncode:
-                with self.log_filename.open('r') as log_file:
-                    logging.error("failed to start server at host %s in %s",
-                                  self.ip_addr, self.workdir.name)
-                    logging.error("last line of %s:", self.log_filename)
-                    log_file.seek(0, 0)
-                    logging.error(log_file.readlines()[-1].rstrip())
-                    log_handler = logging.getLogger().handlers[0]
-                    if hasattr(log_handler, 'baseFilename'):
-                        logpath = log_handler.baseFilename   # type: ignore
-                    else:
-                        logpath = "?"
-                    raise RuntimeError(f"Failed to start server at host {self.ip_addr}.\n"
-                                       "Check the log files:\n"
-                                       f"{logpath}\n"
-                                       f"{self.log_filename}")
+                logging.error("failed to start server at host %s in %s",
+                              self.ip_addr, self.workdir.name)
+                logging.error("last line of %s:", self.log_filename)
+                logging.error(self._read_last_log_line().rstrip())
+                log_handler = logging.getLogger().handlers[0]
+                if hasattr(log_handler, 'baseFilename'):
+                    logpath = log_handler.baseFilename   # type: ignore
+                else:
+                    logpath = "?"
+                raise RuntimeError(f"Failed to start server at host {self.ip_addr}.\n"
+                                   "Check the log files:\n"
+                                   f"{logpath}\n"
+                                   f"{self.log_filename}")
 
             if hasattr(self, "host_id") or await self.get_host_id(api):
                 if await self.cql_is_up():
+                    logging.info("started server at host %s in %s, pid %d", self.ip_addr,
+                                 self.workdir.name, self.cmd.pid)
                     return
 
-            # Sleep and retry
+            # Sleep and retry, backing off so slow servers aren't polled 10 times a second
             await asyncio.sleep(sleep_interval)
+            sleep_interval = min(1.0, sleep_interval * 1.5)
 
         raise RuntimeError(f"failed to start server {self.ip_addr}, "
                            f"check server log at {self.log_filename}")
 
+    def _read_last_log_line(self) -> str:
+        """Return the last line of the log, reading only as much of the
+           end of the file as needed"""
+        with self.log_filename.open('rb') as log:
+            end = log.seek(0, os.SEEK_END)
+            chunk_size = 4096
+            while True:
+                pos = max(0, end - chunk_size)
+                log.seek(pos)
+                lines = log.read().splitlines()
+                # Unless we've read from the start, the first line may be partial
+                if len(lines) > 1 or pos == 0:
+                    return lines[-1].decode(errors='replace') if lines else ""
+                chunk_size *= 2
+
+    async def _wait_for_log_marker(self, marker: bytes, offset: int, deadline: float) -> bool:
+        """Wait until `marker` shows up in the server log after `offset`.
+           Returns False if the server exits or the `deadline` (in event loop
+           time) passes first."""
+        assert self.cmd is not None
+        loop = asyncio.get_running_loop()
+        with self.log_filename.open('rb') as log:
+            log.seek(offset)
+            tail = b''
+            while loop.time() < deadline:
+                chunk = log.read()
+                if chunk:
+                    data = tail + chunk
+                    if marker in data:
+                        return True
+                    # Keep the end of what we've read in case the marker is split
+                    tail = data[-len(marker):]
+                elif self.cmd.returncode is not None:
+                    return False
+                else:
+                    await asyncio.sleep(0.1)
+        return False
+
     async def force_schema_migration(self) -> None:
         """This is a hack to change schema hash on an existing cluster node
         which triggers a gossip round and propagation of entire application
         state. Helps quickly propagate tokens and speed up node boot if the
         previous state propagation was missed."""
-        auth = PlainTextAuthProvider(username='cassandra', password='cassandra')
-        profile = ExecutionProfile(load_balancing_policy=WhiteListRoundRobinPolicy(self.seeds),
-                                   request_timeout=self.START_TIMEOUT)
-        with Cluster(execution_profiles={EXEC_PROFILE_DEFAULT: profile},
-                     contact_points=self.seeds,
-                     auth_provider=auth,
-                     # This is the latest version Scylla supports
-                     protocol_version=4,
-                     ) as cluster:
-            with cluster.connect() as session:
-                session.execute("CREATE KEYSPACE IF NOT EXISTS k WITH REPLICATION = {" +
-                                "'class' : 'SimpleStrategy', 'replication_factor' : 1 }")
-                session.execute("DROP KEYSPACE k")
+        session = await asyncio.get_running_loop().run_in_executor(None, self._control_session)
+        await wrap_future(session.execute_async("CREATE KEYSPACE IF NOT EXISTS k WITH REPLICATION = {" +
+                                                 "'class' : 'SimpleStrategy', 'replication_factor' : 1 }"))
+        await wrap_future(session.execute_async("DROP KEYSPACE k"))
 
     async def shutdown_control_connection(self) -> None:
         """Shut down driver connection"""
-        if self.control_connection is not None:
-            self.control_connection.shutdown()
-            self.control_connection = None
-        if self.control_cluster is not None:
-            self.control_cluster.shutdown()
-            self.control_cluster = None
+        connection, self.control_connection = self.control_connection, None
+        cluster, self.control_cluster = self.control_cluster, None
+
+        def shutdown() -> None:
+            if connection is not None:
+                connection.shutdown()
+            if cluster is not None:
+                cluster.shutdown()
+
+        if connection is not None or cluster is not None:
+            # Driver shutdown blocks until its threads exit, keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, shutdown)
 
     async def stop(self) -> None:
         """Stop a running server. No-op if not running. Uses SIGKILL to
@@ -406,15 +590,15 @@ class ScyllaServer:
         if not self.cmd:
             return
 
-        await self.shutdown_control_connection()
         try:
             self.cmd.terminate()
         except ProcessLookupError:
-            pass
+            await self.shutdown_control_connection()
         else:
+            # Shut down the driver while Scylla drains
             # FIXME: add timeout, fail the test and mark cluster as dirty
             # if we timeout.
-            await self.cmd.wait()
+            await asyncio.gather(self.shutdown_control_connection(), self.cmd.wait())
         finally:
             if self.cmd:
                 logging.info("gracefully stopped %s", self)
@@ -429,26 +613,49 @@ class ScyllaServer:
             return
         logging.info("Uninstalling server at %s", self.workdir)
 
-        shutil.rmtree(self.workdir)
-        self.log_filename.unlink(missing_ok=True)
+        def remove_files() -> None:
+            shutil.rmtree(self.workdir)
+            self.log_filename.unlink(missing_ok=True)
+
+        # Removing a data directory is a lot of blocking syscalls, run them
+        # off the event loop so servers of a cluster are uninstalled in parallel
+        await asyncio.get_running_loop().run_in_executor(None, remove_files)
 
         await self.host_registry.release_host(self.ip_addr)
         del self.ip_addr
+        del self.ip_bytes
 
     def write_log_marker(self, msg) -> None:
         """Write a message to the server's log file (e.g. separator/marker)"""
-        self.log_file.seek(0, 2)  # seek to file end
         self.log_file.write(msg.encode())
-        self.log_file.flush()
 
     def __str__(self):
         ip_addr = getattr(self, 'ip_addr', 'undefined ip')
         host_id = getattr(self, 'host_id', 'undefined id')
         return f"ScyllaServer({self.server_id}, {ip_addr}, {host_id})"
 
-    def _write_config_file(self) -> None:
-        with self.config_filename.open('w') as config_file:
-            yaml.dump(self.config, config_file)
+    def _write_config_file(self) -> bool:
+        """Write self.config to conf/scylla.yaml.
+           Returns False if the file already has the same contents."""
+        # Compare the merged view, the file text differs when own options
+        # override common ones, even with the same values
+        canonical = json.dumps(dict(self.config), sort_keys=True, default=str)
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+        if digest == self.config_digest:
+            return False
+        own_config = self.config.maps[0]
+        if SCYLLA_COMMON_CONF.keys().isdisjoint(own_config):
+            # Only dump what is specific to this server
+            text = SCYLLA_COMMON_CONF_YAML + yaml.dump(own_config, Dumper=SafeDumper)
+        else:
+            # Some common option was overridden, dump everything
+            text = yaml.dump(dict(self.config), Dumper=SafeDumper)
+        # Scylla may be reading the file after a SIGHUP, replace it atomically
+        tmp_filename = self.config_filename.with_suffix(".yaml.tmp")
+        tmp_filename.write_text(text)
+        os.replace(tmp_filename, self.config_filename)
+        self.config_digest = digest
+        return True
 
 
 class ScyllaCluster:
@@ -474,29 +681,73 @@ class ScyllaCluster:
         self.servers = ChainMap(self.running, self.stopped)
         self.decommissioned: Dict[ServerNum, ScyllaServer] = {} # decommissioned servers
         self.removed: Set[ServerNum] = set()                    # removed servers (might be running)
+        # Bumped on any change of running, stopped, removed or decommissioned servers
+        self.topology_version: int = 0
+        # Result of _seeds(), reset on topology changes
+        self.seeds_cache: Optional[List[str]] = None
         # cluster is started (but it might not have running servers)
         self.is_running: bool = False
         # cluster was modified in a way it should not be used in subsequent tests
         self.is_dirty: bool = False
         self.start_exception: Optional[Exception] = None
         self.keyspace_count = 0
+        # Shared by all servers of the cluster, so REST connections are reused
         self.api = ScyllaRESTAPIClient()
 
     async def install_and_start(self) -> None:
         """Setup initial servers and start them.
            Catch and save any startup exception"""
+        servers: List[ScyllaServer] = []
+        ip_addrs: List[IPAddress] = []
         try:
-            for _ in range(self.replicas):
-                await self.add_server()
-            self.keyspace_count = self._get_keyspace_count()
+            servers = [self.create_server(self.name, []) for _ in range(self.replicas)]
+            if servers:
+                # Lease all addresses up front, the first server is the seed of
+                # all others. Installing only touches each server's own workdir,
+                # so install them all concurrently.
+                leases = await asyncio.gather(*(server.host_registry.lease_host()
+                                                for server in servers), return_exceptions=True)
+                ip_addrs = [lease for lease in leases if not isinstance(lease, BaseException)]
+                _raise_first_exception(leases)
+                for server in servers:
+                    server.seeds = [ip_addrs[0]]
+                _raise_first_exception(await asyncio.gather(
+                    *(server.install(ip_addr) for server, ip_addr in zip(servers, ip_addrs)),
+                    return_exceptions=True))
+            # Scylla can't bootstrap several nodes at once, start them one by one
+            for server in servers:
+                await self._start_server(server)
+            self.keyspace_count = await self._get_keyspace_count()
         except Exception as exc:
             # If start fails, swallow the error to throw later,
             # at test time.
             self.start_exception = exc
+            await self._remove_unstarted(servers, ip_addrs)
         self.is_running = True
         logging.info("Created cluster %s", self)
         self.is_dirty = False
 
+    async def _remove_unstarted(self, servers: List[ScyllaServer],
+                                ip_addrs: List[IPAddress]) -> None:
+        """Stop and uninstall servers which failed to install or start, and release
+           addresses no server took. They are neither running nor stopped, so
+           uninstall() doesn't know about them."""
+        installed = [server for server in servers if hasattr(server, "ip_addr")]
+        taken = {server.ip_addr for server in installed}
+
+        async def remove(server: ScyllaServer) -> None:
+            await server.stop()
+            await server.uninstall()
+
+        results = await asyncio.gather(
+            *(remove(server) for server in installed if server.server_id not in self.running),
+            *(servers[0].host_registry.release_host(ip_addr)
+              for ip_addr in ip_addrs if ip_addr not in taken),
+            return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logging.error("Cluster %s cleanup after failed start: %s", self, result)
+
     async def uninstall(self) -> None:
         """Stop running servers, uninstall all servers, and remove API socket"""
         self.is_dirty = True
@@ -513,7 +764,9 @@ class ScyllaCluster:
             await asyncio.gather(*(server.stop() for server in self.running.values()))
             self.stopped.update(self.running)
             self.running.clear()
+            self._topology_changed()
             self.is_running = False
+            await self.api.close()
 
     async def stop_gracefully(self) -> None:
         """Stop all running servers in a clean way"""
@@ -524,25 +777,40 @@ class ScyllaCluster:
             await asyncio.gather(*(server.stop_gracefully() for server in self.running.values()))
             self.stopped.update(self.running)
             self.running.clear()
+            self._topology_changed()
             self.is_running = False
 
+    def _topology_changed(self) -> None:
+        """Invalidate everything derived from the sets of servers"""
+        self.topology_version += 1
+        self.seeds_cache = None
+
     def _seeds(self) -> List[str]:
-        return [server.ip_addr for server in self.running.values()]
+        """Addresses of running servers. The list is shared, don't modify it."""
+        if self.seeds_cache is None:
+            self.seeds_cache = [server.ip_addr for server in self.running.values()]
+        return self.seeds_cache
 
     async def add_server(self) -> ServerInfo:
         """Add a new server to the cluster"""
         server = self.create_server(self.name, self._seeds())
         self.is_dirty = True
+        logging.info("Cluster %s adding server...", self)
+        await server.install()
+        await self._start_server(server)
+        return ServerInfo(server.server_id, server.ip_addr)
+
+    async def _start_server(self, server: ScyllaServer) -> None:
+        """Start an installed server and add it to the running servers"""
         try:
-            logging.info("Cluster %s adding server...", self)
-            await server.install_and_start(self.api)
+            await server.start(self.api)
         except Exception as exc:
             logging.error("Failed to start Scylla server at host %s in %s: %s",
                           server.ip_addr, server.workdir.name, str(exc))
             raise
         self.running[server.server_id] = server
+        self._topology_changed()
         logging.info("Cluster %s added %s", self, server)
-        return ServerInfo(server.server_id, server.ip_addr)
 
     def endpoint(self) -> str:
         """Get a server id (IP) from running servers"""
@@ -579,15 +847,15 @@ class ScyllaCluster:
         return [(server.server_id, server.ip_addr) for server in self.running.values()
                 if server.server_id not in self.removed]
 
-    def _get_keyspace_count(self) -> int:
+    async def _get_keyspace_count(self) -> int:
         """Get the current keyspace count"""
         assert self.start_exception is None
         assert self.running, "No active nodes left"
         server = next(iter(self.running.values()))
         logging.debug("_get_keyspace_count() using server %s", server)
         assert server.control_connection is not None
-        rows = server.control_connection.execute(
-               "select count(*) as c from system_schema.keyspaces")
+        rows = await wrap_future(server.control_connection.execute_async(
+               "select count(*) as c from system_schema.keyspaces"))
         keyspace_count = int(rows.one()[0])
         return keyspace_count
 
@@ -603,11 +871,11 @@ class ScyllaCluster:
         for server in self.running.values():
             server.write_log_marker(f"------ Starting test {name} ------\n")
 
-    def after_test(self, name) -> None:
+    async def after_test(self, name) -> None:
         """Check that the cluster is still alive and the test
         hasn't left any garbage."""
         assert self.start_exception is None
-        if self._get_keyspace_count() != self.keyspace_count:
+        if await self._get_keyspace_count() != self.keyspace_count:
             raise RuntimeError("Test post-condition failed, "
                                "the test must drop all keyspaces it creates.")
         for server in itertools.chain(self.running.values(), self.stopped.values()):
@@ -623,6 +891,7 @@ class ScyllaCluster:
             return ScyllaCluster.ActionReturn(success=False, msg=f"Server {server_id} unknown")
         self.is_dirty = True
         server = self.running.pop(server_id)
+        self._topology_changed()
         if gracefully:
             await server.stop_gracefully()
         else:
@@ -635,11 +904,13 @@ class ScyllaCluster:
         assert server_id in self.stopped, "Server must be stopped when marking as decommissioned"""
         logging.debug("Cluster %s marking %s as decommissioned", self, self.stopped[server_id])
         self.decommissioned[server_id] = self.stopped.pop(server_id)
+        self._topology_changed()
 
     def server_mark_removed(self, server_id: ServerNum) -> None:
         """Mark server as removed."""
         logging.debug("Cluster %s marking server %s as removed", self, server_id)
         self.removed.add(server_id)
+        self._topology_changed()
 
     async def server_start(self, server_id: ServerNum) -> ActionReturn:
         """Start a stopped server"""
@@ -654,6 +925,7 @@ class ScyllaCluster:
         server.seeds = self._seeds()
         await server.start(self.api)
         self.running[server_id] = server
+        self._topology_changed()
         return ScyllaCluster.ActionReturn(success=True, msg=f"{server} started")
 
     async def server_restart(self, server_id: ServerNum) -> ActionReturn:
@@ -692,6 +964,8 @@ class ScyllaClusterManager:
     # pylint: disable=too-many-instance-attributes
     cluster: ScyllaCluster
     site: aiohttp.web.UnixSite
+    manager_dir: str
+    sock_path: str
     is_after_test_ok: bool
 
     def __init__(self, test_uname: str, clusters: Pool[ScyllaCluster], base_dir: str) -> None:
@@ -703,19 +977,23 @@ class ScyllaClusterManager:
         self.is_running: bool = False
         self.is_before_test_ok: bool = False
         self.is_after_test_ok: bool = False
+        # Serialized running servers with the cluster name and topology version they are for
+        self.running_servers_cache: Optional[Tuple[str, int, bytes]] = None
+        self.base_dir: str = base_dir
         # API
-        # NOTE: need to make a safe temp dir as tempfile can't make a safe temp sock name
-        self.manager_dir: str = tempfile.mkdtemp(prefix="manager-", dir=base_dir)
-        self.sock_path: str = f"{self.manager_dir}/api"
-        app = aiohttp.web.Application()
+        app = aiohttp.web.Application(middlewares=[_parse_server_ids])
         self._setup_routes(app)
         self.runner = aiohttp.web.AppRunner(app)
 
     async def start(self) -> None:
-        """Get first cluster, setup API"""
+        """Make the API socket dir, get first cluster, setup API"""
         if self.is_running:
             logging.warning("ScyllaClusterManager already running")
             return
+        # NOTE: need to make a safe temp dir as tempfile can't make a safe temp sock name
+        self.manager_dir = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: tempfile.mkdtemp(prefix="manager-", dir=self.base_dir))
+        self.sock_path = f"{self.manager_dir}/api"
         await self._get_cluster()
         await self.runner.setup()
         self.site = aiohttp.web.UnixSite(self.runner, path=self.sock_path)
@@ -725,8 +1003,12 @@ class ScyllaClusterManager:
     async def _before_test(self, test_case_name: str) -> None:
         if self.cluster.is_dirty:
             await self.clusters.steal()
-            await self.cluster.stop()
-            await self._get_cluster()
+            # Stop the dirty cluster while getting the next one
+            stop_task = asyncio.create_task(self.cluster.stop())
+            try:
+                await self._get_cluster()
+            finally:
+                await stop_task
         self.current_test_case_full_name = f'{self.test_uname}::{test_case_name}'
         logging.info("Leasing Scylla cluster %s for test %s", self.cluster, self.current_test_case_full_name)
         self.cluster.before_test(self.current_test_case_full_name)
@@ -746,8 +1028,8 @@ class ScyllaClusterManager:
             await self.clusters.steal()
             await self.cluster.stop()
         del self.cluster
-        if os.path.exists(self.manager_dir):
-            shutil.rmtree(self.manager_dir)
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: shutil.rmtree(self.manager_dir, ignore_errors=True))
         self.is_running = False
 
     async def _get_cluster(self) -> None:
@@ -761,35 +1043,38 @@ class ScyllaClusterManager:
         app.router.add_get('/cluster/is-dirty', self._is_dirty)
         app.router.add_get('/cluster/replicas', self._cluster_replicas)
         app.router.add_get('/cluster/running-servers', self._cluster_running_servers)
-        app.router.add_get('/cluster/host-ip/{server_id}', self._cluster_server_ip_addr)
-        app.router.add_get('/cluster/host-id/{server_id}', self._cluster_host_id)
-        app.router.add_get('/cluster/before-test/{test_case_name}', self._before_test_req)
-        app.router.add_get('/cluster/after-test', self._after_test)
-        app.router.add_get('/cluster/mark-dirty', self._mark_dirty)
-        app.router.add_get('/cluster/server/{server_id}/stop', self._cluster_server_stop)
-        app.router.add_get('/cluster/server/{server_id}/stop_gracefully',
-                           self._cluster_server_stop_gracefully)
-        app.router.add_get('/cluster/server/{server_id}/start', self._cluster_server_start)
-        app.router.add_get('/cluster/server/{server_id}/restart', self._cluster_server_restart)
-        app.router.add_get('/cluster/addserver', self._cluster_server_add)
-        app.router.add_put('/cluster/remove-node/{initiator}', self._cluster_remove_node)
-        app.router.add_get('/cluster/decommission-node/{server_id}',
-                           self._cluster_decommission_node)
-        app.router.add_get('/cluster/server/{server_id}/get_config', self._server_get_config)
-        app.router.add_put('/cluster/server/{server_id}/update_config', self._server_update_config)
+        app.router.add_get(r'/cluster/host-ip/{server_id:\d+}', self._cluster_server_ip_addr)
+        app.router.add_get(r'/cluster/host-id/{server_id:\d+}', self._cluster_host_id)
+        # Requests changing the cluster are POST (or PUT when they carry data), only
+        # queries are GET
+        app.router.add_post('/cluster/test/setup', self._cluster_test_setup)
+        app.router.add_post('/cluster/after-test', self._after_test)
+        app.router.add_post('/cluster/mark-dirty', self._mark_dirty)
+        app.router.add_post(r'/cluster/server/{server_id:\d+}/stop', self._cluster_server_stop)
+        app.router.add_post(r'/cluster/server/{server_id:\d+}/stop_gracefully',
+                            self._cluster_server_stop_gracefully)
+        app.router.add_post(r'/cluster/server/{server_id:\d+}/start', self._cluster_server_start)
+        app.router.add_post(r'/cluster/server/{server_id:\d+}/restart', self._cluster_server_restart)
+        app.router.add_post('/cluster/addserver', self._cluster_server_add)
+        app.router.add_put(r'/cluster/remove-node/{initiator:\d+}', self._cluster_remove_node)
+        app.router.add_post(r'/cluster/decommission-node/{server_id:\d+}',
+                            self._cluster_decommission_node)
+        app.router.add_post('/cluster/batch', self._cluster_batch)
+        app.router.add_get(r'/cluster/server/{server_id:\d+}/get_config', self._server_get_config)
+        app.router.add_put(r'/cluster/server/{server_id:\d+}/update_config', self._server_update_config)
 
     async def _manager_up(self, _request) -> aiohttp.web.Response:
-        return aiohttp.web.Response(text=f"{self.is_running}")
+        return bool_response(self.is_running)
 
     async def _cluster_up(self, _request) -> aiohttp.web.Response:
         """Is cluster running"""
-        return aiohttp.web.Response(text=f"{self.cluster is not None and self.cluster.is_running}")
+        return bool_response(self.cluster is not None and self.cluster.is_running)
 
     async def _is_dirty(self, _request) -> aiohttp.web.Response:
         """Report if current cluster is dirty"""
         if self.cluster is None:
             return aiohttp.web.Response(status=500, text="No cluster active")
-        return aiohttp.web.Response(text=f"{self.cluster.is_dirty}")
+        return bool_response(self.cluster.is_dirty)
 
     async def _cluster_replicas(self, _request) -> aiohttp.web.Response:
         """Return cluster's configured number of replicas (replication factor)"""
@@ -799,68 +1084,83 @@ class ScyllaClusterManager:
 
     async def _cluster_running_servers(self, _request) -> aiohttp.web.Response:
         """Return a dict of running server ids to IPs"""
-        return aiohttp.web.json_response(self.cluster.running_servers())
+        cluster = self.cluster
+        cache = self.running_servers_cache
+        if cache is None or cache[:2] != (cluster.name, cluster.topology_version):
+            cache = (cluster.name, cluster.topology_version, json_dumps(cluster.running_servers()))
+            self.running_servers_cache = cache
+        return aiohttp.web.Response(body=cache[2], content_type="application/json")
 
     async def _cluster_server_ip_addr(self, request) -> aiohttp.web.Response:
         """IP address of a server"""
-        server_id = ServerNum(int(request.match_info["server_id"]))
-        return aiohttp.web.Response(text=f"{self.cluster.servers[server_id].ip_addr}")
+        server_id = request["server_id"]
+        return aiohttp.web.Response(body=self.cluster.servers[server_id].ip_bytes,
+                                    content_type="text/plain", charset="utf-8")
 
     async def _cluster_host_id(self, request) -> aiohttp.web.Response:
         """IP address of a server"""
-        server_id = ServerNum(int(request.match_info["server_id"]))
-        return aiohttp.web.Response(text=f"{self.cluster.servers[server_id].host_id}")
-
-    async def _before_test_req(self, request) -> aiohttp.web.Response:
-        await self._before_test(request.match_info['test_case_name'])
-        return aiohttp.web.Response(text="OK")
+        server_id = request["server_id"]
+        return aiohttp.web.Response(body=self.cluster.servers[server_id].host_id_bytes,
+                                    content_type="text/plain", charset="utf-8")
+
+    async def _cluster_test_setup(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Before test, returning what a client needs to start the test in the same request:
+           if the cluster was cycled, its running servers, replicas and host ids"""
+        data = json_loads(await request.read())
+        old_cluster = self.cluster
+        await self._before_test(data["test_case_name"])
+        cluster = self.cluster
+        return json_response({"cycled": cluster is not old_cluster,
+                              "running": cluster.running_servers(),
+                              "replicas": cluster.replicas,
+                              "host_ids": {str(server.server_id): server.host_id
+                                           for server in cluster.servers.values()
+                                           if hasattr(server, "host_id")}})
 
     async def _after_test(self, _request) -> aiohttp.web.Response:
         assert self.cluster is not None
         assert self.current_test_case_full_name
         logging.info("Finished test %s, cluster: %s", self.current_test_case_full_name, self.cluster)
         try:
-            self.cluster.after_test(self.current_test_case_full_name)
+            await self.cluster.after_test(self.current_test_case_full_name)
         finally:
             self.current_test_case_full_name = ''
         self.is_after_test_ok = True
-        return aiohttp.web.Response(text="True")
+        return bool_response(True)
 
     async def _mark_dirty(self, _request) -> aiohttp.web.Response:
         """Mark current cluster dirty"""
         assert self.cluster
         self.cluster.is_dirty = True
-        return aiohttp.web.Response(text="OK")
+        return ok_response()
 
     async def _server_stop(self, request: aiohttp.web.Request, gracefully: bool) \
                         -> aiohttp.web.Response:
         """Stop a server. No-op if already stopped."""
         assert self.cluster
-        server_id = ServerNum(int(request.match_info["server_id"]))
+        server_id = request["server_id"]
         ret = await self.cluster.server_stop(server_id, gracefully)
         return aiohttp.web.Response(status=200 if ret[0] else 500, text=ret[1])
 
     async def _cluster_server_stop(self, request) -> aiohttp.web.Response:
         """Stop a specified server"""
-        assert self.cluster
         return await self._server_stop(request, gracefully = False)
 
     async def _cluster_server_stop_gracefully(self, request) -> aiohttp.web.Response:
         """Stop a specified server gracefully"""
-        assert self.cluster
         return await self._server_stop(request, gracefully = True)
 
     async def _cluster_server_start(self, request) -> aiohttp.web.Response:
         """Start a specified server (must be stopped)"""
         assert self.cluster
-        server_id = ServerNum(int(request.match_info["server_id"]))
+        server_id = request["server_id"]
         ret = await self.cluster.server_start(server_id)
         return aiohttp.web.Response(status=200 if ret[0] else 500, text=ret[1])
 
     async def _cluster_server_restart(self, request) -> aiohttp.web.Response:
         """Restart a specified server (must be already started)"""
         assert self.cluster
-        server_id = ServerNum(int(request.match_info["server_id"]))
+        server_id = request["server_id"]
         ret = await self.cluster.server_restart(server_id)
         return aiohttp.web.Response(status=200 if ret[0] else 500, text=ret[1])
 
@@ -868,88 +1168,153 @@ class ScyllaClusterManager:
         """Add a new server"""
         assert self.cluster
         s_info = await self.cluster.add_server()
-        return aiohttp.web.json_response({"server_id" : s_info.server_id,
-                                          "ip_addr": s_info.ip_addr})
+        return json_response({"server_id" : s_info.server_id,
+                              "ip_addr": s_info.ip_addr})
 
     async def _cluster_remove_node(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
         """Run remove node on Scylla REST API for a specified server"""
         assert self.cluster
-        data = await request.json()
-        initiator_id = ServerNum(int(request.match_info["initiator"]))
+        data = json_loads(await request.read())
+        initiator_id = request["initiator"]
         server_id = ServerNum(int(data["server_id"]))
         assert isinstance(data["ignore_dead"], list), "Invalid list of dead IP addresses"
         ignore_dead = [IPAddress(ip_addr) for ip_addr in data["ignore_dead"]]
-        if not initiator_id in self.cluster.running:
+        ret = await self._remove_node(initiator_id, server_id, ignore_dead)
+        return aiohttp.web.Response(status=200 if ret.success else 500, text=ret.msg)
+
+    async def _remove_node(self, initiator_id: ServerNum, server_id: ServerNum,
+                           ignore_dead: List[IPAddress]) -> ScyllaCluster.ActionReturn:
+        """Remove server_id through Scylla REST API of initiator_id"""
+        cluster = self.cluster
+        if not initiator_id in cluster.running:
             logging.error("_cluster_remove_node initiator %s is not a running server",
                           initiator_id)
-            return aiohttp.web.Response(status=500, text=f"Error removing {server_id}")
-        if server_id in self.cluster.running:
+            return ScyllaCluster.ActionReturn(success=False, msg=f"Error removing {server_id}")
+        if server_id in cluster.running:
             logging.warning("_cluster_remove_node %s is a running node", server_id)
-        else:
-            assert server_id in self.cluster.stopped, f"_cluster_remove_node: {server_id} unknown"
-        to_remove = self.cluster.servers[server_id]
-        initiator = self.cluster.servers[initiator_id]
+        elif server_id not in cluster.stopped:
+            logging.error("_cluster_remove_node %s unknown", server_id)
+            return ScyllaCluster.ActionReturn(success=False,
+                                              msg=f"Error removing {server_id}: unknown server")
+        to_remove = cluster.servers[server_id]
+        initiator = cluster.servers[initiator_id]
         logging.info("_cluster_remove_node %s with initiator %s", to_remove, initiator)
 
         # initate remove
         try:
-            await self.cluster.api.remove_node(initiator.ip_addr, to_remove.host_id, ignore_dead)
+            await cluster.api.remove_node(initiator.ip_addr, to_remove.host_id, ignore_dead)
         except RuntimeError as exc:
             logging.error("_cluster_remove_node failed initiator %s server %s ignore_dead %s, check log at %s",
                           initiator, to_remove, ignore_dead, initiator.log_filename)
-            return aiohttp.web.Response(status=500,
-                                        text=f"Error removing {to_remove}: {exc}")
-        self.cluster.server_mark_removed(server_id)
-        return aiohttp.web.Response(text="OK")
+            return ScyllaCluster.ActionReturn(success=False,
+                                              msg=f"Error removing {to_remove}: {exc}")
+        cluster.server_mark_removed(server_id)
+        return ScyllaCluster.ActionReturn(success=True, msg="OK")
 
     async def _cluster_decommission_node(self, request) -> aiohttp.web.Response:
         """Run remove node on Scylla REST API for a specified server"""
         assert self.cluster
-        server_id = ServerNum(int(request.match_info["server_id"]))
+        server_id = request["server_id"]
+        ret = await self._decommission_node(server_id)
+        return aiohttp.web.Response(status=200 if ret.success else 500, text=ret.msg)
+
+    async def _decommission_node(self, server_id: ServerNum) -> ScyllaCluster.ActionReturn:
+        """Decommission a running server through Scylla REST API and stop it"""
+        cluster = self.cluster
         logging.info("_cluster_decommission_node %s", server_id)
-        assert server_id in self.cluster.running, "Can't decommission not running node"
-        if len(self.cluster.running) == 1:
+        if server_id not in cluster.running:
+            logging.error("_cluster_decommission_node %s is not a running server", server_id)
+            return ScyllaCluster.ActionReturn(success=False,
+                                              msg=f"Can't decommission not running node {server_id}")
+        if len(cluster.running) == 1:
             logging.warning("_cluster_decommission_node %s is only running node left", server_id)
-        server = self.cluster.running[server_id]
+        server = cluster.running[server_id]
         try:
-            await self.cluster.api.decommission_node(server.ip_addr)
+            await cluster.api.decommission_node(server.ip_addr)
         except RuntimeError as exc:
             logging.error("_cluster_decommission_node %s, check log at %s", server,
                           server.log_filename)
-            return aiohttp.web.Response(status=500,
-                                        text=f"Error decommissioning {server}: {exc}")
-        await self.cluster.server_stop(server_id, gracefully=True)
-        self.cluster.server_mark_decommissioned(server_id)
-        return aiohttp.web.Response(text="OK")
+            return ScyllaCluster.ActionReturn(success=False,
+                                              msg=f"Error decommissioning {server}: {exc}")
+        await cluster.server_stop(server_id, gracefully=True)
+        cluster.server_mark_decommissioned(server_id)
+        return ScyllaCluster.ActionReturn(success=True, msg="OK")
+
+    async def _cluster_batch(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Run several remove node and decommission operations in one request.
+           Scylla does one topology change at a time, so they run in order,
+           stopping at the first failure. All operations are checked before
+           running any, errors report how many operations completed."""
+        assert self.cluster
+        data = json_loads(await request.read())
+        if not isinstance(data, dict) or not isinstance(data.get("ops"), list):
+            return aiohttp.web.Response(status=400, text="Invalid list of operations")
+        ops: List[Callable[[], Awaitable[ScyllaCluster.ActionReturn]]] = []
+        for i, op in enumerate(data["ops"]):
+            if not isinstance(op, dict):
+                return aiohttp.web.Response(status=400,
+                                            text=f"Invalid operation {op!r} at {i}, none run")
+            try:
+                if op["op"] == "remove":
+                    ignore_dead = op.get("ignore_dead", [])
+                    if not isinstance(ignore_dead, list):
+                        return aiohttp.web.Response(status=400,
+                                                    text=f"Invalid list of dead IP addresses at {i}, none run")
+                    ops.append(functools.partial(self._remove_node,
+                                                 ServerNum(int(op["initiator"])),
+                                                 ServerNum(int(op["server_id"])),
+                                                 [IPAddress(ip_addr) for ip_addr in ignore_dead]))
+                elif op["op"] == "decommission":
+                    ops.append(functools.partial(self._decommission_node,
+                                                 ServerNum(int(op["server_id"]))))
+                else:
+                    return aiohttp.web.Response(status=400,
+                                                text=f"Unknown operation {op['op']} at {i}, none run")
+            except (KeyError, TypeError, ValueError) as exc:
+                return aiohttp.web.Response(status=400,
+                                            text=f"Invalid operation {op} at {i}: {exc!r}, none run")
+        for done, run_op in enumerate(ops):
+            ret = await run_op()
+            if not ret.success:
+                return aiohttp.web.Response(status=500,
+                                            text=f"{ret.msg} ({done} of {len(ops)} operations completed)")
+        return ok_response()
 
     async def _server_get_config(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
         """Get conf/scylla.yaml of the given server as a dictionary."""
         assert self.cluster
-        ret = self.cluster.get_config(ServerNum(int(request.match_info["server_id"])))
+        ret = self.cluster.get_config(request["server_id"])
         if not ret.success:
             return aiohttp.web.Response(status=404, text=ret.msg)
-        return aiohttp.web.json_response(ret.data)
+        return json_response(ret.data)
 
     async def _server_update_config(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
         """Update conf/scylla.yaml of the given server by setting `value` under `key`.
            If the server is running, reload the config with a SIGHUP.
            Marks the cluster as dirty."""
         assert self.cluster
-        data = await request.json()
-        ret = self.cluster.update_config(ServerNum(int(request.match_info["server_id"])),
+        data = json_loads(await request.read())
+        ret = self.cluster.update_config(request["server_id"],
                                          data['key'], data['value'])
         if not ret.success:
             return aiohttp.web.Response(status=404, text=ret.msg)
         return aiohttp.web.Response()
 
 
-@asynccontextmanager
-async def get_cluster_manager(test_uname: str, clusters: Pool[ScyllaCluster], test_path: str) \
-        -> AsyncIterator[ScyllaClusterManager]:
+class _ClusterManagerContext:
+    """Stops the manager on exit, see get_cluster_manager()"""
+    def __init__(self, manager: ScyllaClusterManager) -> None:
+        self.manager = manager
+
+    async def __aenter__(self) -> ScyllaClusterManager:
+        return self.manager
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.manager.stop()
+
+
+def get_cluster_manager(test_uname: str, clusters: Pool[ScyllaCluster], test_path: str) \
+        -> AsyncContextManager[ScyllaClusterManager]:
     """Create a temporary manager for the active cluster used in a test
        and provide the cluster to the caller."""
-    manager = ScyllaClusterManager(test_uname, clusters, test_path)
-    try:
-        yield manager
-    finally:
-        await manager.stop()
+    return _ClusterManagerContext(ScyllaClusterManager(test_uname, clusters, test_path))
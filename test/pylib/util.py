@@ -5,7 +5,11 @@
 #
 import time
 import asyncio
+import logging
 from typing import Callable, Awaitable, Optional, TypeVar, Generic
+from cassandra.cluster import ResponseFuture  # type: ignore # pylint: disable=no-name-in-module
+
+logger = logging.getLogger(__name__)
 
 unique_name_prefix = 'test_'
 T = TypeVar('T')
@@ -29,4 +33,33 @@ async def wait_for(pred: Callable[[], Awaitable[Optional[T]]], deadline: float)
         await asyncio.sleep(1)
 
 
+def wrap_future(f: ResponseFuture) -> asyncio.Future:
+    """Wrap a cassandra Future into an asyncio.Future object.
+
+    Args:
+        f: future to wrap
+
+    Returns:
+        And asyncio.Future object which can be awaited.
+    """
+    loop = asyncio.get_event_loop()
+    aio_future = loop.create_future()
+
+    def on_result(result):
+        if not aio_future.done():
+            loop.call_soon_threadsafe(aio_future.set_result, result)
+        else:
+            logger.debug("wrap_future: on_result() on already done future: %s", result)
+
+    def on_error(exception, *_):
+        if not aio_future.done():
+            loop.call_soon_threadsafe(aio_future.set_exception, exception)
+        else:
+            logger.debug("wrap_future: on_error() on already done future: %s", exception)
+
+    f.add_callback(on_result)
+    f.add_errback(on_error)
+    return aio_future
+
+
 unique_name.last_ms = 0
@@ -11,10 +11,10 @@ import logging
 import ssl
 from typing import List
 from test.pylib.random_tables import RandomTables
-from test.pylib.util import unique_name
+from test.pylib.util import unique_name, wrap_future
 from test.pylib.manager_client import ManagerClient, IPAddress
 import pytest
-from cassandra.cluster import Session, ResponseFuture                    # type: ignore # pylint: disable=no-name-in-module
+from cassandra.cluster import Session                                    # type: ignore # pylint: disable=no-name-in-module
 from cassandra.cluster import Cluster, ConsistencyLevel                  # type: ignore # pylint: disable=no-name-in-module
 from cassandra.cluster import ExecutionProfile, EXEC_PROFILE_DEFAULT     # type: ignore # pylint: disable=no-name-in-module
 from cassandra.policies import RoundRobinPolicy                          # type: ignore
@@ -47,35 +47,6 @@ def event_loop(request):
     loop.close()
 
 
-def _wrap_future(f: ResponseFuture) -> asyncio.Future:
-    """Wrap a cassandra Future into an asyncio.Future object.
-
-    Args:
-        f: future to wrap
-
-    Returns:
-        And asyncio.Future object which can be awaited.
-    """
-    loop = asyncio.get_event_loop()
-    aio_future = loop.create_future()
-
-    def on_result(result):
-        if not aio_future.done():
-            loop.call_soon_threadsafe(aio_future.set_result, result)
-        else:
-            logger.debug("_wrap_future: on_result() on already done future: %s", result)
-
-    def on_error(exception, *_):
-        if not aio_future.done():
-            loop.call_soon_threadsafe(aio_future.set_exception, exception)
-        else:
-            logger.debug("_wrap_future: on_error() on already done future: %s"), result
-
-    f.add_callback(on_result)
-    f.add_errback(on_error)
-    return aio_future
-
-
 def run_async(self, *args, **kwargs) -> asyncio.Future:
     # The default timeouts should have been more than enough, but in some
     # extreme cases with a very slow debug build running on a slow or very busy
@@ -83,7 +54,7 @@ def run_async(self, *args, **kwargs) -> asyncio.Future:
     # incremented to 200 seconds.
     # See issue #11289.
     kwargs.setdefault("timeout", 200.0)
-    return _wrap_future(self.execute_async(*args, **kwargs))
+    return wrap_future(self.execute_async(*args, **kwargs))
 
 
 Session.run_async = run_async
@@ -56,6 +56,23 @@ async def test_remove_node_add_column(manager, random_tables):
     await random_tables.verify_schema()
 
 
+@pytest.mark.asyncio
+async def test_remove_nodes_batch_add_column(manager, random_tables):
+    """Add two nodes, remove two original nodes in one batch, add a column"""
+    servers = await manager.running_servers()
+    table = await random_tables.add_table(ncolumns=5)
+    await manager.server_add()
+    await manager.server_add()
+    await manager.server_stop_gracefully(servers[1].server_id)              # stop     [1]
+    await manager.server_stop_gracefully(servers[2].server_id)              # stop     [2]
+    await manager.topology_batch([                                          # Remove   [1], [2]
+        {"op": "remove", "initiator": servers[0].server_id, "server_id": servers[1].server_id,
+         "ignore_dead": [servers[2].ip_addr]},
+        {"op": "remove", "initiator": servers[0].server_id, "server_id": servers[2].server_id}])
+    await table.add_column()
+    await random_tables.verify_schema()
+
+
 @pytest.mark.asyncio
 @pytest.mark.skip(reason="Flaky due to #11780")
 async def test_decommission_node_add_column(manager, random_tables):